@@ -327,7 +327,7 @@ with tab2:
             with tab_stats2:
                 st.markdown("**Regression Analysis:** Testing for inverted U-curve relationship")
                 
-                regression_results = perform_regression_analysis(results)
+                regression_results = perform_regression_analysis(results, with_inference=True)
                 
                 if regression_results:
                     col_r1, col_r2 = st.columns(2)
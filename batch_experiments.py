@@ -1,14 +1,124 @@
+import os
+import logging
+import multiprocessing
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import json
+from scipy import stats
 from simulation_core import SimulationEnvironment
-from statistical_analysis import (
-    perform_anova_analysis, perform_regression_analysis,
-    perform_comprehensive_causal_analysis
+
+logger = logging.getLogger(__name__)
+
+def _run_single_experiment(experiment):
+    """Run a single experiment; executed inside a worker process"""
+    config = experiment['config']
+    
+    env = SimulationEnvironment(
+        world_size=config.get('world_size', 15),
+        num_agents=config.get('num_agents', 8),
+        num_food=config.get('num_food', 10),
+        num_dangers=config.get('num_dangers', 5),
+        bandwidth_bits=config.get('bandwidth_bits', 1000),
+        vision_radius=config.get('vision_radius', 3)
+    )
+    
+    num_runs = config.get('num_runs', 5)
+    num_steps = config.get('num_steps', 30)
+    base_seed = config.get('seed')
+    
+    runs = [None] * num_runs
+    for run_idx in range(num_runs):
+        seed = None if base_seed is None else base_seed + run_idx
+        env.initialize(seed=seed)
+        
+        runs[run_idx] = env.run_episode(num_steps=num_steps)
+    
+    aggregated_stats = _aggregate_runs(runs)
+    
+    return {
+        'name': experiment['name'],
+        'config': config,
+        'runs': runs,
+        'aggregated': aggregated_stats,
+        'timestamp': experiment['timestamp']
+    }
+
+
+RUN_METRICS = (
+    'net_efficiency', 'coordination_rate', 'food_collected',
+    'dangers_hit', 'message_delivery_rate'
 )
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+RUN_METRIC_INDEX = {key: idx for idx, key in enumerate(RUN_METRICS)}
+_RUN_METRIC_DEFAULTS = (0,) * len(RUN_METRICS)
+
+
+def _runs_to_matrix(runs):
+    """Pack per-run metrics into a C-contiguous float64 matrix and its column index"""
+    matrix = np.empty((len(runs), len(RUN_METRICS)), dtype=np.float64, order='C')
+    for i, r in enumerate(runs):
+        matrix[i] = tuple(map(r.get, RUN_METRICS, _RUN_METRIC_DEFAULTS))
+    
+    return matrix, RUN_METRIC_INDEX
+
+
+def _aggregate_runs(runs):
+    """Aggregate statistics across multiple runs"""
+    buf, col = _runs_to_matrix(runs)
+    eff, coord, food = col['net_efficiency'], col['coordination_rate'], col['food_collected']
+    dangers, msg = col['dangers_hit'], col['message_delivery_rate']
+    
+    n = len(runs)
+    totals = buf.sum(axis=0)
+    means = totals / n
+    stds = buf.std(axis=0)
+    mins, maxs = buf.min(axis=0), buf.max(axis=0)
+    
+    return {
+        'efficiency': {
+            'mean': means[eff],
+            'std': stds[eff],
+            'min': mins[eff],
+            'max': maxs[eff]
+        },
+        'coordination': {
+            'mean': means[coord],
+            'std': stds[coord]
+        },
+        'food': {
+            'mean': means[food],
+            'total': int(totals[food])
+        },
+        'dangers': {
+            'mean': means[dangers],
+            'total': int(totals[dangers])
+        },
+        'msg_delivery': {
+            'mean': means[msg],
+            'std': stds[msg]
+        }
+    }
+
+
+def _collect_aggregate_arrays(results):
+    """Gather per-experiment aggregate metrics into NumPy arrays"""
+    n = len(results)
+    
+    def column(section, stat):
+        return np.fromiter(
+            (r['aggregated'][section][stat] for r in results), float, count=n
+        )
+    
+    return {
+        'names': [r['name'] for r in results],
+        'eff_mean': column('efficiency', 'mean'),
+        'eff_std': column('efficiency', 'std'),
+        'coord_mean': column('coordination', 'mean'),
+        'food_mean': column('food', 'mean'),
+        'msg_mean': column('msg_delivery', 'mean')
+    }
+
 
 class BatchExperimentRunner:
     """Run batch experiments with multiple configurations"""
@@ -17,6 +127,23 @@ class BatchExperimentRunner:
         self.experiments = []
         self.results = []
     
+    @property
+    def results(self):
+        """Per-experiment results from the last batch run"""
+        return self._results
+    
+    @results.setter
+    def results(self, value):
+        self._results = value
+        self._agg_cache = None
+    
+    @property
+    def _agg_arrays(self):
+        """Aggregate metric arrays for self.results, rebuilt whenever results is reassigned"""
+        if self._agg_cache is None:
+            self._agg_cache = _collect_aggregate_arrays(self._results)
+        return self._agg_cache
+    
     def add_experiment(self, name, config):
         """Add an experiment configuration to the batch"""
         self.experiments.append({
@@ -26,85 +153,43 @@ class BatchExperimentRunner:
         })
     
     def run_batch(self, progress_callback=None):
-        """Run all experiments in the batch"""
-        self.results = []
+        """Run all experiments in the batch, in parallel when more than one worker is available"""
         total_experiments = len(self.experiments)
-        
-        for idx, experiment in enumerate(self.experiments):
-            if progress_callback:
-                progress_callback(idx / total_experiments)
-            
-            result = self._run_single_experiment(experiment)
-            self.results.append(result)
+        max_workers = min(total_experiments, os.cpu_count() or 1)
+        results = [None] * total_experiments
         
         if progress_callback:
-            progress_callback(1.0)
+            progress_callback(0.0)
         
-        return self.results
-    
-    def _run_single_experiment(self, experiment):
-        """Run a single experiment"""
-        config = experiment['config']
-        
-        env = SimulationEnvironment(
-            world_size=config.get('world_size', 15),
-            num_agents=config.get('num_agents', 8),
-            num_food=config.get('num_food', 10),
-            num_dangers=config.get('num_dangers', 5),
-            bandwidth_bits=config.get('bandwidth_bits', 1000),
-            vision_radius=config.get('vision_radius', 3)
-        )
-        
-        runs = []
-        for run_idx in range(config.get('num_runs', 5)):
-            seed = config.get('seed', 42) + run_idx if config.get('seed') is not None else None
-            env.initialize(seed=seed)
+        if max_workers == 1:
+            for idx, experiment in enumerate(self.experiments):
+                results[idx] = _run_single_experiment(experiment)
+                
+                if progress_callback and idx + 1 < total_experiments:
+                    progress_callback((idx + 1) / total_experiments)
+        elif total_experiments:
+            # spawn rather than fork: the Streamlit caller is multithreaded
+            mp_context = multiprocessing.get_context('spawn')
             
-            stats = env.run_episode(num_steps=config.get('num_steps', 30))
-            runs.append(stats)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+                futures = {
+                    executor.submit(_run_single_experiment, experiment): idx
+                    for idx, experiment in enumerate(self.experiments)
+                }
+                
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    
+                    if progress_callback and completed < total_experiments:
+                        progress_callback(completed / total_experiments)
         
-        aggregated_stats = self._aggregate_runs(runs)
+        # Only replace results once every experiment has succeeded
+        self.results = results
         
-        return {
-            'name': experiment['name'],
-            'config': config,
-            'runs': runs,
-            'aggregated': aggregated_stats,
-            'timestamp': experiment['timestamp']
-        }
-    
-    def _aggregate_runs(self, runs):
-        """Aggregate statistics across multiple runs"""
-        efficiencies = [r.get('net_efficiency', 0) for r in runs]
-        coord_rates = [r.get('coordination_rate', 0) for r in runs]
-        food_collected = [r.get('food_collected', 0) for r in runs]
-        dangers_hit = [r.get('dangers_hit', 0) for r in runs]
-        msg_delivery_rates = [r.get('message_delivery_rate', 0) for r in runs]
+        if progress_callback:
+            progress_callback(1.0)
         
-        return {
-            'efficiency': {
-                'mean': np.mean(efficiencies),
-                'std': np.std(efficiencies),
-                'min': np.min(efficiencies),
-                'max': np.max(efficiencies)
-            },
-            'coordination': {
-                'mean': np.mean(coord_rates),
-                'std': np.std(coord_rates)
-            },
-            'food': {
-                'mean': np.mean(food_collected),
-                'total': sum(food_collected)
-            },
-            'dangers': {
-                'mean': np.mean(dangers_hit),
-                'total': sum(dangers_hit)
-            },
-            'msg_delivery': {
-                'mean': np.mean(msg_delivery_rates),
-                'std': np.std(msg_delivery_rates)
-            }
-        }
+        return self.results
     
     def generate_comparison_report(self):
         """Generate a comparison report across all experiments"""
@@ -121,37 +206,58 @@ class BatchExperimentRunner:
     
     def _create_summary_table(self):
         """Create summary table of all experiments"""
-        rows = []
-        for result in self.results:
-            agg = result['aggregated']
-            rows.append({
-                'Experiment': result['name'],
-                'Agents': result['config']['num_agents'],
-                'Bandwidth': result['config']['bandwidth_bits'],
-                'Mean Efficiency': agg['efficiency']['mean'],
-                'Std Efficiency': agg['efficiency']['std'],
-                'Mean Coordination': agg['coordination']['mean'],
-                'Runs': result['config'].get('num_runs', 5)
-            })
+        arrays = self._agg_arrays
+        configs = [result['config'] for result in self.results]
         
-        return pd.DataFrame(rows)
+        return pd.DataFrame({
+            'Experiment': arrays['names'],
+            'Agents': [config['num_agents'] for config in configs],
+            'Bandwidth': [config['bandwidth_bits'] for config in configs],
+            'Mean Efficiency': arrays['eff_mean'],
+            'Std Efficiency': arrays['eff_std'],
+            'Mean Coordination': arrays['coord_mean'],
+            'Runs': [config.get('num_runs', 5) for config in configs]
+        })
     
     def _find_best_performer(self):
         """Find the best performing experiment"""
-        best_idx = max(range(len(self.results)), 
-                       key=lambda i: self.results[i]['aggregated']['efficiency']['mean'])
+        arrays = self._agg_arrays
+        best_idx = int(arrays['eff_mean'].argmax())
         
         return {
-            'name': self.results[best_idx]['name'],
-            'efficiency': self.results[best_idx]['aggregated']['efficiency']['mean'],
+            'name': arrays['names'][best_idx],
+            'efficiency': arrays['eff_mean'][best_idx],
             'config': self.results[best_idx]['config']
         }
     
-    def _perform_statistical_comparison(self):
-        """Perform statistical comparison across experiments"""
+    def _perform_statistical_comparison(self, with_anova_table=False):
+        """Perform statistical comparison across experiments (ANOVA table if with_anova_table)"""
         if len(self.results) < 2:
             return None
         
+        groups = [
+            np.fromiter((run.get('net_efficiency', 0) for run in result['runs']), float)
+            for result in self.results
+        ]
+        
+        try:
+            f_statistic, p_value = stats.f_oneway(*groups)
+            
+            return {
+                'anova': self._build_anova_table() if with_anova_table else None,
+                'f_statistic': f_statistic,
+                'p_value': p_value,
+                'significant': p_value < 0.05
+            }
+        except (ValueError, np.linalg.LinAlgError, RuntimeError) as e:
+            logger.debug("Statistical comparison failed: %s", e)
+            return None
+    
+    def _build_anova_table(self):
+        """Fit an OLS model per experiment and return its ANOVA table"""
+        from statsmodels.formula.api import ols
+        from statsmodels.stats.anova import anova_lm
+        
         data_records = []
         for result in self.results:
             for run in result['runs']:
@@ -162,22 +268,9 @@ class BatchExperimentRunner:
                 })
         
         df = pd.DataFrame(data_records)
+        model = ols('efficiency ~ C(experiment)', data=df).fit()
         
-        try:
-            from statsmodels.formula.api import ols
-            from statsmodels.stats.anova import anova_lm
-            
-            model = ols('efficiency ~ C(experiment)', data=df).fit()
-            anova_table = anova_lm(model, typ=2)
-            
-            return {
-                'anova': anova_table,
-                'f_statistic': anova_table['F'].iloc[0],
-                'p_value': anova_table['PR(>F)'].iloc[0],
-                'significant': anova_table['PR(>F)'].iloc[0] < 0.05
-            }
-        except:
-            return None
+        return anova_lm(model, typ=2)
 
 
 class AutomatedReportGenerator:
@@ -185,6 +278,7 @@ class AutomatedReportGenerator:
     
     def __init__(self, batch_results):
         self.batch_results = batch_results
+        self._agg_arrays = _collect_aggregate_arrays(batch_results)
     
     def generate_full_report(self):
         """Generate a comprehensive report"""
@@ -207,18 +301,19 @@ class AutomatedReportGenerator:
     
     def _create_executive_summary(self):
         """Create executive summary"""
-        efficiencies = [r['aggregated']['efficiency']['mean'] for r in self.batch_results]
+        arrays = self._agg_arrays
+        efficiencies = arrays['eff_mean']
         
-        best_idx = np.argmax(efficiencies)
-        worst_idx = np.argmin(efficiencies)
+        best_idx = int(efficiencies.argmax())
+        worst_idx = int(efficiencies.argmin())
         
         return {
-            'best_experiment': self.batch_results[best_idx]['name'],
+            'best_experiment': arrays['names'][best_idx],
             'best_efficiency': efficiencies[best_idx],
-            'worst_experiment': self.batch_results[worst_idx]['name'],
+            'worst_experiment': arrays['names'][worst_idx],
             'worst_efficiency': efficiencies[worst_idx],
-            'mean_across_all': np.mean(efficiencies),
-            'std_across_all': np.std(efficiencies)
+            'mean_across_all': efficiencies.mean(),
+            'std_across_all': efficiencies.std()
         }
     
     def _create_detailed_results(self):
@@ -248,15 +343,15 @@ class AutomatedReportGenerator:
     
     def _create_efficiency_plot(self):
         """Create efficiency comparison plot"""
-        names = [r['name'] for r in self.batch_results]
-        means = [r['aggregated']['efficiency']['mean'] for r in self.batch_results]
-        stds = [r['aggregated']['efficiency']['std'] for r in self.batch_results]
+        import plotly.graph_objects as go
+        
+        arrays = self._agg_arrays
         
         fig = go.Figure(data=[
             go.Bar(
-                x=names,
-                y=means,
-                error_y=dict(type='data', array=stds),
+                x=arrays['names'],
+                y=arrays['eff_mean'],
+                error_y=dict(type='data', array=arrays['eff_std']),
                 marker_color='#3498db'
             )
         ])
@@ -272,13 +367,14 @@ class AutomatedReportGenerator:
     
     def _create_coordination_plot(self):
         """Create coordination comparison plot"""
-        names = [r['name'] for r in self.batch_results]
-        means = [r['aggregated']['coordination']['mean'] for r in self.batch_results]
+        import plotly.graph_objects as go
+        
+        arrays = self._agg_arrays
         
         fig = go.Figure(data=[
             go.Bar(
-                x=names,
-                y=means,
+                x=arrays['names'],
+                y=arrays['coord_mean'],
                 marker_color='#2ecc71'
             )
         ])
@@ -298,25 +394,26 @@ class AutomatedReportGenerator:
         if len(self.batch_results) > 5:
             return None
         
+        import plotly.graph_objects as go
+        
         fig = go.Figure()
         
         categories = ['Efficiency', 'Coordination', 'Food', 'Msg Delivery']
         
-        for result in self.batch_results:
-            agg = result['aggregated']
-            
-            values = [
-                agg['efficiency']['mean'],
-                agg['coordination']['mean'] * 10,
-                agg['food']['mean'],
-                agg['msg_delivery']['mean'] * 10
-            ]
-            
+        arrays = self._agg_arrays
+        radar_values = np.column_stack([
+            arrays['eff_mean'],
+            arrays['coord_mean'] * 10,
+            arrays['food_mean'],
+            arrays['msg_mean'] * 10
+        ])
+        
+        for name, values in zip(arrays['names'], radar_values):
             fig.add_trace(go.Scatterpolar(
                 r=values,
                 theta=categories,
                 fill='toself',
-                name=result['name']
+                name=name
             ))
         
         fig.update_layout(
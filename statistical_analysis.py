@@ -1,13 +1,10 @@
+import logging
 import numpy as np
 import pandas as pd
 from scipy import stats
 from scipy.optimize import curve_fit
-import statsmodels.api as sm
-from statsmodels.formula.api import ols
-from statsmodels.stats.anova import anova_lm
-from statsmodels.stats.multicomp import pairwise_tukeyhsd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+logger = logging.getLogger(__name__)
 
 def quadratic_func(x, a, b, c):
     """Quadratic function for inverted U-curve fitting"""
@@ -16,36 +13,62 @@ def quadratic_func(x, a, b, c):
 def log_quadratic_func(x, a, b, c):
     """Quadratic function in log space"""
     log_x = np.log(x)
-    return a * log_x**2 + b * log_x + c
+    return a * log_x * log_x + b * log_x + c
 
-def perform_anova_analysis(bandwidth_results):
-    """Perform one-way ANOVA across bandwidth groups"""
+def perform_anova_analysis(bandwidth_results, with_tukey=True):
+    """Perform one-way ANOVA across bandwidth groups, ordered by ascending bandwidth (Tukey HSD if with_tukey)"""
     if not bandwidth_results or len(bandwidth_results) < 2:
         return None
     
-    data_records = []
-    for result in bandwidth_results:
-        bandwidth = result['bandwidth']
-        for efficiency in result['efficiencies']:
-            data_records.append({
-                'bandwidth': bandwidth,
-                'bandwidth_group': f'BW_{bandwidth}',
-                'efficiency': efficiency
-            })
+    sizes = np.array([len(r['efficiencies']) for r in bandwidth_results])
+    sample_bw = np.repeat([r['bandwidth'] for r in bandwidth_results], sizes)
+    y = np.concatenate([np.asarray(r['efficiencies'], dtype=float) for r in bandwidth_results])
+    
+    order = np.argsort(sample_bw, kind='stable')
+    sample_bw, y = sample_bw[order], y[order]
+    group_bw, offsets, group_sizes = np.unique(sample_bw, return_index=True, return_counts=True)
     
-    df = pd.DataFrame(data_records)
+    group_sums = np.add.reduceat(y, offsets)
+    group_means = group_sums / group_sizes
     
-    model = ols('efficiency ~ C(bandwidth_group)', data=df).fit()
-    anova_table = anova_lm(model, typ=2)
+    df_between = len(group_bw) - 1
+    df_within = len(y) - len(group_bw)
+    if df_between <= 0 or df_within <= 0:
+        return None
     
-    f_statistic = anova_table['F'].iloc[0]
-    p_value = anova_table['PR(>F)'].iloc[0]
+    ss_between = (group_sizes * (group_means - y.mean())**2).sum()
+    ss_within = np.maximum(y @ y - (group_sums**2 / group_sizes).sum(), 0.0)
     
-    tukey_result = pairwise_tukeyhsd(
-        endog=df['efficiency'],
-        groups=df['bandwidth_group'],
-        alpha=0.05
-    )
+    f_statistic = (ss_between / df_between) / (ss_within / df_within)
+    p_value = stats.f.sf(f_statistic, df_between, df_within)
+    
+    anova_table = pd.DataFrame({
+        'sum_sq': [ss_between, ss_within],
+        'df': [float(df_between), float(df_within)],
+        'F': [f_statistic, np.nan],
+        'PR(>F)': [p_value, np.nan]
+    }, index=['C(bandwidth_group)', 'Residual'])
+    
+    group_labels = [f'BW_{bw}' for bw in group_bw]
+    
+    tukey_result = None
+    df = None
+    if with_tukey:
+        from statsmodels.stats.multicomp import pairwise_tukeyhsd
+        
+        sample_labels = np.repeat(group_labels, group_sizes)
+        
+        tukey_result = pairwise_tukeyhsd(
+            endog=y,
+            groups=sample_labels,
+            alpha=0.05
+        )
+        
+        df = pd.DataFrame({
+            'bandwidth': sample_bw,
+            'bandwidth_group': sample_labels,
+            'efficiency': y
+        })
     
     return {
         'anova_table': anova_table,
@@ -53,27 +76,36 @@ def perform_anova_analysis(bandwidth_results):
         'p_value': p_value,
         'tukey_hsd': tukey_result,
         'significant': p_value < 0.05,
+        'group_labels': group_labels,
+        'groups': np.split(y, offsets[1:]),
         'dataframe': df
     }
 
-def perform_regression_analysis(bandwidth_results):
-    """Perform regression analysis to test for inverted U-curve"""
+def perform_regression_analysis(bandwidth_results, with_inference=False):
+    """Perform regression analysis to test for inverted U-curve (OLS inference if with_inference)"""
     if not bandwidth_results or len(bandwidth_results) < 3:
         return None
     
     bandwidths = np.array([r['bandwidth'] for r in bandwidth_results])
     efficiencies = np.array([r['mean_efficiency'] for r in bandwidth_results])
+    log_bw = np.log(bandwidths)
     
-    linear_model = np.polyfit(np.log(bandwidths), efficiencies, 1)
-    linear_pred = np.poly1d(linear_model)(np.log(bandwidths))
-    linear_r2 = 1 - (np.sum((efficiencies - linear_pred)**2) / 
-                     np.sum((efficiencies - np.mean(efficiencies))**2))
+    centered = efficiencies - efficiencies.mean()
+    ss_tot = centered @ centered
+    
+    linear_model, linear_residuals, *_ = np.polyfit(log_bw, efficiencies, 1, full=True)
+    if linear_residuals.size:
+        linear_ss_res = linear_residuals[0]
+    else:
+        # polyfit omits residuals for rank-deficient fits (e.g. a single bandwidth)
+        linear_resid = efficiencies - np.polyval(linear_model, log_bw)
+        linear_ss_res = linear_resid @ linear_resid
+    linear_r2 = 1 - linear_ss_res / ss_tot
     
     try:
         quad_params, _ = curve_fit(log_quadratic_func, bandwidths, efficiencies)
-        quad_pred = log_quadratic_func(bandwidths, *quad_params)
-        quad_r2 = 1 - (np.sum((efficiencies - quad_pred)**2) / 
-                       np.sum((efficiencies - np.mean(efficiencies))**2))
+        quad_resid = efficiencies - log_quadratic_func(bandwidths, *quad_params)
+        quad_r2 = 1 - (quad_resid @ quad_resid) / ss_tot
         
         has_inverted_u = quad_params[0] < 0
         
@@ -81,18 +113,25 @@ def perform_regression_analysis(bandwidth_results):
         if has_inverted_u:
             optimal_log_bw = -quad_params[1] / (2 * quad_params[0])
             optimal_bw = np.exp(optimal_log_bw)
-    except:
+    except RuntimeError as e:
+        logger.debug("Log-quadratic fit did not converge: %s", e)
         quad_params = None
         quad_r2 = None
         has_inverted_u = False
         optimal_bw = None
     
-    X = sm.add_constant(np.column_stack([
-        np.log(bandwidths),
-        np.log(bandwidths)**2
-    ]))
-    
-    ols_model = sm.OLS(efficiencies, X).fit()
+    ols_model = None
+    ols_summary = None
+    if with_inference:
+        import statsmodels.api as sm
+        
+        X = sm.add_constant(np.column_stack([
+            log_bw,
+            log_bw**2
+        ]))
+        
+        ols_model = sm.OLS(efficiencies, X).fit()
+        ols_summary = ols_model.summary()
     
     return {
         'linear_coef': linear_model,
@@ -102,7 +141,7 @@ def perform_regression_analysis(bandwidth_results):
         'has_inverted_u': has_inverted_u,
         'optimal_bandwidth': optimal_bw,
         'ols_model': ols_model,
-        'ols_summary': ols_model.summary(),
+        'ols_summary': ols_summary,
         'bandwidths': bandwidths,
         'efficiencies': efficiencies
     }
@@ -116,8 +155,15 @@ def perform_paired_t_test(phase_a_data, phase_b_data):
 
 def calculate_effect_size(phase_a_data, phase_b_data):
     """Calculate Cohen's d effect size"""
-    mean_diff = np.mean(phase_a_data) - np.mean(phase_b_data)
-    pooled_std = np.sqrt((np.var(phase_a_data) + np.var(phase_b_data)) / 2)
+    return _cohens_d_from_stats(
+        np.mean(phase_a_data), np.var(phase_a_data),
+        np.mean(phase_b_data), np.var(phase_b_data)
+    )
+
+def _cohens_d_from_stats(mean_a, var_a, mean_b, var_b):
+    """Calculate Cohen's d from precomputed per-phase means and variances"""
+    mean_diff = mean_a - mean_b
+    pooled_std = np.sqrt((var_a + var_b) / 2)
     
     if pooled_std == 0:
         return 0
@@ -139,31 +185,37 @@ def calculate_effect_size(phase_a_data, phase_b_data):
         'mean_diff': mean_diff
     }
 
-def perform_comprehensive_causal_analysis(causal_results):
-    """Perform comprehensive statistical analysis of causal test results"""
-    phase_a = causal_results['phase_a']['efficiencies']
-    phase_b = causal_results['phase_b']['efficiencies']
-    phase_c = causal_results['phase_c']['efficiencies']
+def perform_comprehensive_causal_analysis(causal_results, with_anova_table=False):
+    """Perform comprehensive statistical analysis of causal test results (ANOVA table if with_anova_table)"""
+    phase_a = np.asarray(causal_results['phase_a']['efficiencies'], dtype=float)
+    phase_b = np.asarray(causal_results['phase_b']['efficiencies'], dtype=float)
+    phase_c = np.asarray(causal_results['phase_c']['efficiencies'], dtype=float)
     
     t_ab, p_ab = perform_paired_t_test(phase_a, phase_b)
     t_bc, p_bc = perform_paired_t_test(phase_b, phase_c)
     t_ac, p_ac = perform_paired_t_test(phase_a, phase_c)
     
-    effect_ab = calculate_effect_size(phase_a, phase_b)
-    effect_bc = calculate_effect_size(phase_b, phase_c)
-    effect_ac = calculate_effect_size(phase_a, phase_c)
+    mean_a, var_a = phase_a.mean(), phase_a.var()
+    mean_b, var_b = phase_b.mean(), phase_b.var()
+    mean_c, var_c = phase_c.mean(), phase_c.var()
     
-    data_records = []
-    for eff in phase_a:
-        data_records.append({'phase': 'A', 'efficiency': eff})
-    for eff in phase_b:
-        data_records.append({'phase': 'B', 'efficiency': eff})
-    for eff in phase_c:
-        data_records.append({'phase': 'C', 'efficiency': eff})
+    effect_ab = _cohens_d_from_stats(mean_a, var_a, mean_b, var_b)
+    effect_bc = _cohens_d_from_stats(mean_b, var_b, mean_c, var_c)
+    effect_ac = _cohens_d_from_stats(mean_a, var_a, mean_c, var_c)
     
-    df = pd.DataFrame(data_records)
-    model = ols('efficiency ~ C(phase)', data=df).fit()
-    anova_table = anova_lm(model, typ=2)
+    overall_f, overall_p = stats.f_oneway(phase_a, phase_b, phase_c)
+    
+    anova_table = None
+    if with_anova_table:
+        from statsmodels.formula.api import ols
+        from statsmodels.stats.anova import anova_lm
+        
+        df = pd.DataFrame({
+            'phase': np.repeat(['A', 'B', 'C'], [len(phase_a), len(phase_b), len(phase_c)]),
+            'efficiency': np.concatenate([phase_a, phase_b, phase_c])
+        })
+        model = ols('efficiency ~ C(phase)', data=df).fit()
+        anova_table = anova_lm(model, typ=2)
     
     return {
         't_test_a_vs_b': {'t': t_ab, 'p': p_ab},
@@ -173,8 +225,8 @@ def perform_comprehensive_causal_analysis(causal_results):
         'effect_size_b_vs_c': effect_bc,
         'effect_size_a_vs_c': effect_ac,
         'anova': anova_table,
-        'overall_f': anova_table['F'].iloc[0],
-        'overall_p': anova_table['PR(>F)'].iloc[0]
+        'overall_f': overall_f,
+        'overall_p': overall_p
     }
 
 def create_regression_plot(regression_results):
@@ -182,6 +234,8 @@ def create_regression_plot(regression_results):
     if not regression_results:
         return None
     
+    import plotly.graph_objects as go
+    
     bandwidths = regression_results['bandwidths']
     efficiencies = regression_results['efficiencies']
     
@@ -238,13 +292,11 @@ def create_anova_boxplot(anova_results):
     if not anova_results:
         return None
     
-    df = anova_results['dataframe']
+    import plotly.graph_objects as go
     
     fig = go.Figure()
     
-    for group in df['bandwidth_group'].unique():
-        group_data = df[df['bandwidth_group'] == group]['efficiency']
-        
+    for group, group_data in zip(anova_results['group_labels'], anova_results['groups']):
         fig.add_trace(go.Box(
             y=group_data,
             name=group.replace('BW_', ''),
@@ -266,6 +318,8 @@ def create_effect_size_plot(causal_analysis):
     if not causal_analysis:
         return None
     
+    import plotly.graph_objects as go
+    
     comparisons = ['A vs B\n(Remove)', 'B vs C\n(Restore)', 'A vs C\n(Consistency)']
     cohens_d = [
         causal_analysis['effect_size_a_vs_b']['cohens_d'],
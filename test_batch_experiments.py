@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from batch_experiments import BatchExperimentRunner, _run_single_experiment
+
+
+def _seeded_runner():
+    runner = BatchExperimentRunner()
+    for bw in (100, 1000, 10000):
+        runner.add_experiment(f'BW {bw}', {
+            'bandwidth_bits': bw, 'num_runs': 2, 'num_steps': 10, 'seed': 7
+        })
+    return runner
+
+
+def test_run_batch_preserves_submission_order(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 3)
+    runner = _seeded_runner()
+    
+    results = runner.run_batch()
+    
+    assert [r['name'] for r in results] == ['BW 100', 'BW 1000', 'BW 10000']
+    for experiment, result in zip(runner.experiments, results):
+        assert result['aggregated'] == _run_single_experiment(experiment)['aggregated']
+
+
+def test_run_batch_keeps_previous_results_on_failure(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 3)
+    runner = _seeded_runner()
+    previous = runner.run_batch()
+    
+    runner.add_experiment('Broken', {'num_runs': 'two'})
+    with pytest.raises(TypeError):
+        runner.run_batch()
+    
+    assert runner.results is previous
@@ -0,0 +1,44 @@
+import warnings
+
+import numpy as np
+from scipy import stats
+
+from statistical_analysis import perform_anova_analysis, perform_regression_analysis
+
+
+def test_anova_matches_scipy_f_oneway():
+    rng = np.random.default_rng(0)
+    bandwidth_results = [
+        {'bandwidth': bw, 'efficiencies': list(rng.normal(loc, 1.0, size))}
+        for bw, loc, size in [(1000, 6.0, 5), (100, 4.0, 7), (10000, 5.0, 4)]
+    ]
+    
+    result = perform_anova_analysis(bandwidth_results, with_tukey=False)
+    
+    groups = [r['efficiencies'] for r in sorted(bandwidth_results, key=lambda r: r['bandwidth'])]
+    expected_f, expected_p = stats.f_oneway(*groups)
+    
+    assert np.isclose(result['f_statistic'], expected_f)
+    assert np.isclose(result['p_value'], expected_p)
+    assert result['group_labels'] == ['BW_100', 'BW_1000', 'BW_10000']
+
+
+def test_anova_returns_none_without_within_group_df():
+    bandwidth_results = [
+        {'bandwidth': 100, 'efficiencies': [4.0]},
+        {'bandwidth': 1000, 'efficiencies': [6.0]}
+    ]
+    
+    assert perform_anova_analysis(bandwidth_results) is None
+
+
+def test_linear_r2_is_zero_for_a_single_bandwidth():
+    bandwidth_results = [
+        {'bandwidth': 1000, 'mean_efficiency': e} for e in (1.0, 2.0, 4.0)
+    ]
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = perform_regression_analysis(bandwidth_results)
+    
+    assert result['linear_r2'] == 0.0